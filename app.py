@@ -8,7 +8,7 @@ through a web interface with AI-driven natural language processing capabilities.
 Author: Abhinav Singh (RA2211033010203)
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, render_template, request, session, Response, stream_with_context, send_file, abort, g
 import subprocess
 import sys
 import os
@@ -18,12 +18,27 @@ from pathlib import Path
 import psutil
 import openai
 import json
+import re
+import shlex
 import uuid
+import functools
+import heapq
+import time
+import threading
+import atexit
+from collections import deque, OrderedDict
 from datetime import datetime
+import numpy as np
+import orjson
+import requests
 
 app = Flask(__name__)
 app.secret_key = 'pyterminal_web_secret_key_2024'
 
+def ojsonify(obj, status=200):
+    """Build a JSON response using orjson instead of Flask's stdlib encoder."""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
 # OpenAI API configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 if not OPENAI_API_KEY:
@@ -33,21 +48,135 @@ else:
     openai.api_key = OPENAI_API_KEY
     AI_ENABLED = True
 
-# Store command history per session
+# Share one pooled HTTP session across all OpenAI calls so TCP/TLS connections
+# are kept alive between requests instead of being set up per worker thread.
+OPENAI_TIMEOUT = 30
+_openai_session = requests.Session()
+_openai_session.mount("https://", requests.adapters.HTTPAdapter(
+    pool_connections=1, pool_maxsize=20, max_retries=openai.api_requestor.MAX_CONNECTION_RETRIES))
+openai.requestssession = _openai_session
+
+# Common natural language phrasings routed to AI even for short commands
+_NL_PATTERN = re.compile(r"\b(?:show me|list all|create a|what is|how to|can you)\b", re.IGNORECASE)
+
+# Largest file prefix returned inline by cat
+MAX_CAT_BYTES = 1024 * 1024
+
+# System metrics sampled in the background so cpu/mem never block a request
+STATS_REFRESH_INTERVAL = 0.5
+_stats = {"cpu": psutil.cpu_percent(interval=None), "mem": psutil.virtual_memory()}
+
+def _refresh_stats():
+    """Continuously sample CPU and memory usage into _stats."""
+    while True:
+        try:
+            _stats["cpu"] = psutil.cpu_percent(interval=STATS_REFRESH_INTERVAL)
+            _stats["mem"] = psutil.virtual_memory()
+        except Exception:
+            time.sleep(STATS_REFRESH_INTERVAL)
+
+threading.Thread(target=_refresh_stats, daemon=True).start()
+
+# Separators used in tabular command output
+_PROCESS_SEPARATOR = "-" * 30
+_HISTORY_SEPARATOR = "-" * 50
+
+# External commands without shell syntax are exec'd directly instead of via /bin/sh.
+# cmd.exe parsing differs from POSIX shells, so Windows always goes through the shell.
+_IS_WINDOWS = platform.system() == "Windows"
+_SHELL_META = frozenset("|&;<>(){}$`\\\"'*?[]~#\n")
+
+# Output kept in history for streamed commands
+STREAM_HISTORY_MAX_CHARS = 64 * 1024
+
+# Store command history per session, bounded to the most recent entries
+HISTORY_MAX_ENTRIES = 200
 command_history = {}
 
+# Semantic cache of natural language requests, keyed on prompt embeddings
+SEMCACHE_FILE = os.path.expanduser("~/.pyterminal_semcache.npz")
+SEMCACHE_MODEL = "text-embedding-3-small"
+SEMCACHE_DIM = 1536
+SEMCACHE_THRESHOLD = 0.92
+SEMCACHE_MAX_ENTRIES = 2048
+# Words that look like literal operands (paths, file names, numbers, MixedCase
+# names); a cached command is only reused when these match the new request
+_OPERAND_PATTERN = re.compile(r"[./\\\d]|\B[A-Z]")
+
+emb_matrix = np.empty((0, SEMCACHE_DIM), dtype=np.float32)
+cmd_list = []
+operand_list = []
+_semcache_lock = threading.Lock()
+
+def _load_semantic_cache():
+    """Load the persisted semantic cache from disk, if present."""
+    global emb_matrix, cmd_list, operand_list
+    try:
+        with np.load(SEMCACHE_FILE, allow_pickle=False) as data:
+            embeddings = data['embeddings'].astype(np.float32)
+            commands = [str(c) for c in data['commands']]
+            operands = [str(o) for o in data['operands']]
+    except Exception:
+        # A missing, truncated or otherwise unreadable cache just starts empty
+        return
+    
+    if (embeddings.ndim == 2 and embeddings.shape[1] == SEMCACHE_DIM
+            and len(commands) == len(embeddings) == len(operands)):
+        emb_matrix = embeddings[-SEMCACHE_MAX_ENTRIES:]
+        cmd_list = commands[-SEMCACHE_MAX_ENTRIES:]
+        operand_list = operands[-SEMCACHE_MAX_ENTRIES:]
+
+def _save_semantic_cache():
+    """Persist the semantic cache to disk for reuse across sessions."""
+    with _semcache_lock:
+        if not cmd_list:
+            return
+        # Write to a temporary file and rename it into place, so a kill
+        # mid-write never leaves a partial cache behind
+        tmp_file = f"{SEMCACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                np.savez(f, embeddings=emb_matrix, commands=np.array(cmd_list, dtype=np.str_),
+                         operands=np.array(operand_list, dtype=np.str_))
+            os.replace(tmp_file, SEMCACHE_FILE)
+        except OSError:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+
+if AI_ENABLED:
+    _load_semantic_cache()
+    atexit.register(_save_semantic_cache)
+
 def get_session_id():
     """Get or create session ID for command history."""
     if 'session_id' not in session:
         session['session_id'] = str(uuid.uuid4())
     return session['session_id']
 
+def get_cwd():
+    """Get the session's working directory, starting in the user's home directory."""
+    if 'cwd' not in session:
+        session['cwd'] = os.path.expanduser('~')
+    return session['cwd']
+
+def _resolve_path(path):
+    """Resolve a user-supplied path against the session's working directory."""
+    return os.path.join(get_cwd(), os.path.expanduser(path))
+
+def _path_within_cwd(path):
+    """Return the real path if it lies under the session's working directory, else None."""
+    cwd = os.path.realpath(get_cwd())
+    real_path = os.path.realpath(_resolve_path(path))
+    return real_path if os.path.commonpath([cwd, real_path]) == cwd else None
+
 def add_to_history(session_id, command, output, success):
     """Add command to session history."""
-    if session_id not in command_history:
-        command_history[session_id] = []
-    
-    command_history[session_id].append({
+    # dict.setdefault and deque.append are each atomic, so concurrent
+    # requests for the same session cannot lose entries.
+    history = command_history.setdefault(session_id, deque(maxlen=HISTORY_MAX_ENTRIES))
+    history.append({
         'timestamp': datetime.now().isoformat(),
         'command': command,
         'output': output,
@@ -65,97 +194,82 @@ def run_command(command):
     Returns:
         tuple: (success: bool, output: str, error: str)
     """
-    # Split command into parts
-    parts = command.strip().split()
-    if not parts:
+    route, parts = _route_command(command)
+    if route is None:
         return False, "", "Empty command"
     
-    cmd = parts[0].lower()
-    args = parts[1:] if len(parts) > 1 else []
+    if route == "native":
+        return _DISPATCH[parts[0].lower()](parts[1:])
     
-    # Check if this should be processed by AI
-    if (len(parts) > 2 and 
-        cmd not in ["pwd", "ls", "cd", "mkdir", "rm", "cat", "cpu", "mem", "memory", 
-                   "processes", "ps", "help", "tellmeabout_developer", "clear"] and
-        AI_ENABLED):
+    if route == "ai":
         return _handle_ai_command(command)
     
-    # Also check for common natural language patterns even with fewer words
-    natural_language_patterns = ["show me", "list all", "create a", "what is", "how to", "can you"]
-    if (any(pattern in command.lower() for pattern in natural_language_patterns) and AI_ENABLED):
-        return _handle_ai_command(command)
+    # For non-native commands, use subprocess
+    return _handle_external_command(command)
+
+def _route_command(command):
+    """
+    Decide how run_command handles a command.
     
-    # Handle native Python commands
-    if cmd == "pwd":
-        return _handle_pwd()
-    elif cmd == "ls":
-        return _handle_ls(args)
-    elif cmd == "cd":
-        return _handle_cd_robust(args)
-    elif cmd == "mkdir":
-        return _handle_mkdir_robust(args)
-    elif cmd == "rm":
-        return _handle_rm_robust(args)
-    elif cmd == "cat":
-        return _handle_cat_robust(args)
-    elif cmd == "cpu":
-        return _handle_cpu()
-    elif cmd in ["mem", "memory"]:
-        return _handle_memory()
-    elif cmd in ["processes", "ps"]:
-        return _handle_processes()
-    elif cmd == "help":
-        return _handle_help()
-    elif cmd == "tellmeabout_developer":
-        return _handle_developer_info()
-    elif cmd == "clear":
-        return _handle_clear()
-    elif cmd == "history":
-        return _handle_history()
-    else:
-        # For non-native commands, use subprocess
-        return _handle_external_command(command)
+    Returns:
+        tuple: (route, parts) where route is "native", "ai", "external",
+        or None for an empty command
+    """
+    parts = command.strip().split()
+    if not parts:
+        return None, parts
+    
+    # Native Python commands come first; they never go to AI
+    if parts[0].lower() in _DISPATCH:
+        return "native", parts
+    
+    # Commands longer than 2 words, or matching common natural language
+    # patterns, are processed by AI
+    if AI_ENABLED and (len(parts) > 2 or _NL_PATTERN.search(command)):
+        return "ai", parts
+    
+    return "external", parts
 
-def _handle_pwd():
+def _handle_pwd(args=None):
     """Handle pwd command - print working directory."""
     try:
-        current_dir = os.getcwd()
-        return True, current_dir, ""
+        return True, get_cwd(), ""
     except Exception as e:
         return False, "", f"Error getting current directory: {str(e)}"
 
+_SIZE_UNITS = ("B", "KB", "MB")
+
+def _format_size(size):
+    """Format a file size as whole B/KB/MB for ls output."""
+    idx = min(max(size.bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size >> (10 * idx)}{_SIZE_UNITS[idx]}"
+
 def _handle_ls(args):
     """Handle ls command - list directory contents."""
     try:
         target_dir = args[0] if args else "."
+        target_path = _resolve_path(target_dir)
         
-        if not os.path.exists(target_dir):
+        if not os.path.exists(target_path):
             return False, "", f"Directory not found: '{target_dir}'"
         
-        if not os.path.isdir(target_dir):
+        if not os.path.isdir(target_path):
             return False, "", f"Not a directory: '{target_dir}'"
         
-        items = os.listdir(target_dir)
-        if not items:
+        with os.scandir(target_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        if not entries:
             return True, "Directory is empty", ""
         
         output_lines = []
-        for item in sorted(items):
-            item_path = os.path.join(target_dir, item)
-            if os.path.isdir(item_path):
-                output_lines.append(f"📁 {item}/")
+        for entry in entries:
+            if entry.is_dir():
+                output_lines.append(f"📁 {entry.name}/")
             else:
                 try:
-                    size = os.path.getsize(item_path)
-                    if size < 1024:
-                        size_str = f"{size}B"
-                    elif size < 1024 * 1024:
-                        size_str = f"{size // 1024}KB"
-                    else:
-                        size_str = f"{size // (1024 * 1024)}MB"
-                    output_lines.append(f"📄 {item} ({size_str})")
+                    output_lines.append(f"📄 {entry.name} ({_format_size(entry.stat().st_size)})")
                 except OSError:
-                    output_lines.append(f"📄 {item}")
+                    output_lines.append(f"📄 {entry.name}")
         
         return True, "\n".join(output_lines), ""
         
@@ -170,17 +284,17 @@ def _handle_cd_robust(args):
     target_dir = args[0]
     
     try:
-        if target_dir == "..":
-            os.chdir("..")
-        elif target_dir == ".":
-            pass
-        elif target_dir.startswith("~"):
-            target_dir = os.path.expanduser(target_dir)
-            os.chdir(target_dir)
-        else:
-            os.chdir(target_dir)
-        
-        return True, f"Changed to: {os.getcwd()}", ""
+        # Only the session's directory changes; the server process never chdirs
+        new_dir = os.path.realpath(_resolve_path(target_dir))
+        if not os.path.exists(new_dir):
+            raise FileNotFoundError(new_dir)
+        if not os.path.isdir(new_dir):
+            raise NotADirectoryError(new_dir)
+        if not os.access(new_dir, os.X_OK):
+            raise PermissionError(new_dir)
+        
+        session['cwd'] = new_dir
+        return True, f"Changed to: {new_dir}", ""
         
     except FileNotFoundError:
         return False, "", f"cd: no such directory: '{args[0]}'"
@@ -199,7 +313,7 @@ def _handle_mkdir_robust(args):
     dir_name = args[0]
     
     try:
-        os.makedirs(dir_name, exist_ok=False)
+        os.makedirs(_resolve_path(dir_name), exist_ok=False)
         return True, f"Created directory: {dir_name}", ""
         
     except FileExistsError:
@@ -219,10 +333,11 @@ def _handle_rm_robust(args):
     file_name = args[0]
     
     try:
-        if os.path.isdir(file_name):
+        file_path = _resolve_path(file_name)
+        if os.path.isdir(file_path):
             return False, "", f"rm: cannot remove '{file_name}': Is a directory"
         
-        os.remove(file_name)
+        os.remove(file_path)
         return True, f"Removed file: {file_name}", ""
         
     except FileNotFoundError:
@@ -242,14 +357,22 @@ def _handle_cat_robust(args):
     file_name = args[0]
     
     try:
-        if not os.path.exists(file_name):
+        file_path = _resolve_path(file_name)
+        if not os.path.exists(file_path):
             return False, "", f"cat: no such file: '{file_name}'"
         
-        if not os.path.isfile(file_name):
+        if not os.path.isfile(file_path):
             return False, "", f"cat: '{file_name}' is not a file"
         
-        with open(file_name, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            raw = f.read(MAX_CAT_BYTES + 1)
+            file_size = os.fstat(f.fileno()).st_size
+        
+        content = raw[:MAX_CAT_BYTES].decode('utf-8', errors='replace')
+        if len(raw) > MAX_CAT_BYTES:
+            content += f"\n... [truncated at 1MB; file size {file_size} bytes]"
+            # Lets /execute point the client at /cat for the whole file
+            g.cat_truncated_path = os.path.realpath(file_path)
         
         return True, content, ""
         
@@ -262,73 +385,65 @@ def _handle_cat_robust(args):
     except Exception as e:
         return False, "", f"cat: error: {str(e)}"
 
-def _handle_cpu():
+def _handle_cpu(args=None):
     """Handle cpu command - show CPU usage percentage."""
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = _stats["cpu"]
         return True, f"CPU Usage: {cpu_percent}%", ""
     except Exception as e:
         return False, "", f"Error getting CPU usage: {str(e)}"
 
-def _handle_memory():
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+def _format_bytes(bytes_value):
+    """Format a byte count with one decimal, picking the unit from its bit length."""
+    idx = min(max(bytes_value.bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (10 * idx)):.1f} {_BYTE_UNITS[idx]}"
+
+def _handle_memory(args=None):
     """Handle mem/memory command - show memory usage details."""
     try:
-        memory = psutil.virtual_memory()
+        memory = _stats["mem"]
         
-        def format_bytes(bytes_value):
-            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                if bytes_value < 1024.0:
-                    return f"{bytes_value:.1f} {unit}"
-                bytes_value /= 1024.0
-            return f"{bytes_value:.1f} PB"
+        total = _format_bytes(memory.total)
+        available = _format_bytes(memory.available)
+        used = _format_bytes(memory.used)
         
-        total = format_bytes(memory.total)
-        available = format_bytes(memory.available)
-        used = format_bytes(memory.used)
-        
-        output = f"Memory Usage: {memory.percent}%\n"
-        output += f"Total: {total} | Available: {available} | Used: {used}"
+        output = "\n".join([
+            f"Memory Usage: {memory.percent}%",
+            f"Total: {total} | Available: {available} | Used: {used}"
+        ])
         
         return True, output, ""
     except Exception as e:
         return False, "", f"Error getting memory usage: {str(e)}"
 
-def _handle_processes():
+def _iter_processes():
+    """Yield (pid, name) pairs for running processes, skipping inaccessible ones."""
+    for proc in psutil.process_iter(['pid', 'name']):
+        try:
+            yield proc.info['pid'], proc.info['name']
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+
+def _handle_processes(args=None):
     """Handle processes/ps command - show running processes."""
     try:
-        processes = []
-        total_count = 0
-        
-        for proc in psutil.process_iter(['pid', 'name']):
-            total_count += 1
-            try:
-                processes.append((proc.info['pid'], proc.info['name']))
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
+        total_count = len(psutil.pids())
+        processes = heapq.nsmallest(20, _iter_processes(), key=lambda x: x[0])
         
-        processes.sort(key=lambda x: x[0])
-        
-        output = f"Total Processes: {total_count}\n"
-        output += "Showing top 20:\n"
-        output += "PID     Name\n"
-        output += "-" * 30 + "\n"
-        
-        for pid, name in processes[:20]:
-            output += f"{pid:<8} {name}\n"
+        out = [f"Total Processes: {total_count}", "Showing top 20:", "PID     Name", _PROCESS_SEPARATOR]
+        out.extend(f"{pid:<8} {name}" for pid, name in processes)
         
         if total_count > 20:
-            output += f"... and {total_count - 20} more processes"
+            out.append(f"... and {total_count - 20} more processes")
         
-        return True, output, ""
+        return True, "\n".join(out), ""
     except Exception as e:
         return False, "", f"Error getting process list: {str(e)}"
 
-def _handle_help():
-    """Handle help command - show available commands and descriptions."""
-    try:
-        ai_status = "Enabled" if AI_ENABLED else "Disabled"
-        
-        help_text = f"""Available Commands:
+# Static help and developer text, built once since AI_ENABLED is fixed at startup
+_HELP_TEXT = f"""Available Commands:
 ls <dir>     - List files and directories in the current folder
 cd <dir>     - Change the current working directory
 pwd          - Print the current working directory
@@ -345,20 +460,13 @@ tellmeabout_developer - Show developer information
 
 AI Features:
 Natural Language - Type natural language commands (3+ words)
-AI Status: {ai_status}
+AI Status: {"Enabled" if AI_ENABLED else "Disabled"}
 
 Note: External system commands are also supported through subprocess.
 
 designed by Abhinav"""
-        
-        return True, help_text, ""
-    except Exception as e:
-        return False, "", f"Error displaying help: {str(e)}"
 
-def _handle_developer_info():
-    """Handle tellmeabout_developer command - show developer information."""
-    try:
-        developer_info = """
+_DEV_INFO = """
 +==============================================================+
 |                    DEVELOPER INFORMATION                    |
 +==============================================================+
@@ -374,42 +482,76 @@ def _handle_developer_info():
 
 Thank you for using PyTerminal Web!
 """
-        
-        return True, developer_info, ""
-    except Exception as e:
-        return False, "", f"Error displaying developer information: {str(e)}"
 
-def _handle_clear():
+def _handle_help(args=None):
+    """Handle help command - show available commands and descriptions."""
+    return True, _HELP_TEXT, ""
+
+def _handle_developer_info(args=None):
+    """Handle tellmeabout_developer command - show developer information."""
+    return True, _DEV_INFO, ""
+
+def _handle_clear(args=None):
     """Handle clear command - clear terminal screen."""
     return True, "CLEAR_SCREEN", ""
 
-def _handle_history():
+def _handle_history(args=None):
     """Handle history command - show command history."""
     try:
         session_id = get_session_id()
         if session_id not in command_history or not command_history[session_id]:
             return True, "No commands in history", ""
         
-        history_output = "Command History:\n"
-        history_output += "-" * 50 + "\n"
-        
-        for i, entry in enumerate(command_history[session_id][-20:], 1):  # Show last 20 commands
-            status = "✓" if entry['success'] else "✗"
-            history_output += f"{i:2d}. {status} {entry['command']}\n"
+        out = ["Command History:", _HISTORY_SEPARATOR]
+        out.extend(
+            f"{i:2d}. {'✓' if entry['success'] else '✗'} {entry['command']}"
+            for i, entry in enumerate(list(command_history[session_id])[-20:], 1)  # Show last 20 commands
+        )
         
-        return True, history_output, ""
+        return True, "\n".join(out), ""
     except Exception as e:
         return False, "", f"Error displaying history: {str(e)}"
 
-def interpret_natural_language(user_input):
+# Native command dispatch table, keyed by command name
+_DISPATCH = {
+    "pwd": _handle_pwd,
+    "ls": _handle_ls,
+    "cd": _handle_cd_robust,
+    "mkdir": _handle_mkdir_robust,
+    "rm": _handle_rm_robust,
+    "cat": _handle_cat_robust,
+    "cpu": _handle_cpu,
+    "mem": _handle_memory,
+    "memory": _handle_memory,
+    "processes": _handle_processes,
+    "ps": _handle_processes,
+    "help": _handle_help,
+    "tellmeabout_developer": _handle_developer_info,
+    "clear": _handle_clear,
+    "history": _handle_history,
+}
+
+def _normalize(user_input):
     """
-    Interpret natural language input and convert it to terminal commands using OpenAI GPT.
+    Normalize natural language input into a stable cache key.
+
+    Only whitespace is collapsed: case is kept because file names in the
+    request are case-sensitive on most filesystems.
     """
-    if not AI_ENABLED:
-        return False, "", "", "AI features are disabled. Please set OPENAI_API_KEY environment variable."
-    
-    try:
-        system_prompt = """You are a helpful assistant that converts natural language requests into terminal commands. 
+    return " ".join(user_input.split())
+
+# Generated commands keyed on the whitespace-normalized request
+INTERPRET_CACHE_MAX_ENTRIES = 1024
+_interpret_cache = OrderedDict()
+_interpret_cache_lock = threading.Lock()
+
+def _request_command(user_input):
+    """
+    Ask OpenAI GPT for the command matching a natural language request.
+
+    Raises on failure so that failed requests are never cached.
+    """
+    system_prompt = """You are a helpful assistant that converts natural language requests into terminal commands. 
 Return ONLY the terminal commands needed to accomplish the task, nothing else. 
 Use standard bash commands. If multiple commands are needed, separate them with &&.
 Example: 
@@ -417,34 +559,118 @@ Input: "create a folder called documents and make a file notes.txt inside it"
 Output: "mkdir documents && cd documents && touch notes.txt"
 """
 
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_input}
-            ],
-            max_tokens=150,
-            temperature=0.1
-        )
-        
-        ai_response = response.choices[0].message.content.strip()
-        
-        if ai_response:
-            command = ai_response
-            explanation = f"AI converted: '{user_input}' to terminal command"
-            return True, command, explanation, ""
-        else:
-            return False, "", "", "AI could not generate a valid command."
-            
+    response = openai.ChatCompletion.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_input}
+        ],
+        max_tokens=150,
+        temperature=0.1,
+        request_timeout=OPENAI_TIMEOUT
+    )
+    
+    ai_response = response.choices[0].message.content.strip()
+    
+    if not ai_response:
+        raise ValueError("AI could not generate a valid command.")
+    
+    return ai_response
+
+def _interpret_cached(user_input):
+    """Return the command for a request, reusing earlier answers to equivalent requests."""
+    key = _normalize(user_input)
+    with _interpret_cache_lock:
+        command = _interpret_cache.get(key)
+        if command is not None:
+            _interpret_cache.move_to_end(key)
+            return command
+    
+    command = _request_command(user_input)
+    with _interpret_cache_lock:
+        _interpret_cache[key] = command
+        if len(_interpret_cache) > INTERPRET_CACHE_MAX_ENTRIES:
+            _interpret_cache.popitem(last=False)
+    return command
+
+def interpret_natural_language(user_input):
+    """
+    Interpret natural language input and convert it to terminal commands using OpenAI GPT.
+    """
+    if not AI_ENABLED:
+        return False, "", "", "AI features are disabled. Please set OPENAI_API_KEY environment variable."
+    
+    try:
+        command = _interpret_cached(user_input)
+        return True, command, f"AI converted: '{user_input}' to terminal command", ""
+    except ValueError as e:
+        return False, "", "", str(e)
     except Exception as e:
         return False, "", "", f"AI Error: {str(e)}"
 
+@functools.lru_cache(maxsize=1024)
+def _embed(normalized_input):
+    """Return the L2-normalized embedding of a normalized request."""
+    response = openai.Embedding.create(
+        model=SEMCACHE_MODEL,
+        input=normalized_input,
+        request_timeout=OPENAI_TIMEOUT
+    )
+    vector = np.asarray(response['data'][0]['embedding'], dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
+
+def _operands(user_input):
+    """Return the request's literal operands as a comparable string."""
+    words = (word.strip("\"'`,;:!?()") for word in user_input.split())
+    return "\n".join(word for word in words if _OPERAND_PATTERN.search(word))
+
+def _semantic_lookup(query_vector, operands):
+    """
+    Return the cached command most similar to the query, if close enough.
+
+    Near-duplicates such as "delete old.log" and "delete new.log" embed almost
+    identically, so the cached request must also name the same operands.
+    """
+    with _semcache_lock:
+        matches = [i for i, cached in enumerate(operand_list) if cached == operands]
+        if not matches:
+            return None
+        sims = emb_matrix[matches] @ query_vector
+        best = int(sims.argmax())
+        if sims[best] >= SEMCACHE_THRESHOLD:
+            return cmd_list[matches[best]]
+    return None
+
+def _semantic_store(query_vector, operands, command):
+    """Add an (embedding, operands, command) entry, evicting the oldest past the cap."""
+    global emb_matrix, cmd_list, operand_list
+    with _semcache_lock:
+        emb_matrix = np.vstack([emb_matrix, query_vector[np.newaxis, :]])[-SEMCACHE_MAX_ENTRIES:]
+        cmd_list = (cmd_list + [command])[-SEMCACHE_MAX_ENTRIES:]
+        operand_list = (operand_list + [operands])[-SEMCACHE_MAX_ENTRIES:]
+
 def _handle_ai_command(natural_language_input):
     """Handle AI-driven natural language command processing."""
-    success, command, explanation, error = interpret_natural_language(natural_language_input)
+    try:
+        query_vector = _embed(_normalize(natural_language_input))
+    except Exception:
+        # Embedding failures only disable the semantic cache for this request
+        query_vector = None
     
-    if not success:
-        return False, "", error
+    operands = _operands(natural_language_input)
+    command = _semantic_lookup(query_vector, operands) if query_vector is not None else None
+    
+    if command is None:
+        success, command, explanation, error = interpret_natural_language(natural_language_input)
+        
+        if not success:
+            return False, "", error
+        
+        if command and query_vector is not None:
+            _semantic_store(query_vector, operands, command)
     
     if command:
         # Execute the command
@@ -452,24 +678,84 @@ def _handle_ai_command(natural_language_input):
     else:
         return False, "", "AI could not generate a valid command."
 
+def _needs_shell(command):
+    """Return True if the command relies on shell syntax and cannot be exec'd directly."""
+    if _IS_WINDOWS or any(c in _SHELL_META for c in command):
+        return True
+    # Leading VAR=value assignments are also shell syntax
+    return "=" in command.split(None, 1)[0]
+
+def _shell_args(command):
+    """Return (args, shell) for subprocess, avoiding an intermediate shell when possible."""
+    if _needs_shell(command):
+        return command, True
+    return shlex.split(command), False
+
+_SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+def _sse(data, event=None):
+    """Format a JSON payload as a Server-Sent Events message."""
+    message = f"data: {json.dumps(data)}\n\n"
+    return f"event: {event}\n{message}" if event else message
+
+def _stream_external_command(command, status):
+    """
+    Run an external command, yielding its combined stdout/stderr line by line.
+    
+    Once the generator is exhausted, status holds 'success' and 'error' for the run.
+    """
+    status['success'], status['error'] = False, ""
+    
+    args, shell = _shell_args(command)
+    popen_kwargs = dict(stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1, cwd=get_cwd(),
+                        encoding='utf-8', errors='replace')
+    try:
+        try:
+            process = subprocess.Popen(args, shell=shell, **popen_kwargs)
+        except FileNotFoundError:
+            # Shell builtins have no executable of their own; let the shell run them
+            process = subprocess.Popen(command, shell=True, **popen_kwargs)
+    except Exception as e:
+        status['error'] = f"Error executing external command: {str(e)}"
+        return
+    
+    timer = threading.Timer(30, process.kill)
+    timer.start()
+    try:
+        yield from process.stdout
+        returncode = process.wait()
+        status['success'] = returncode == 0
+        if not timer.is_alive() and returncode != 0:
+            status['error'] = "Command timed out after 30 seconds"
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+
 def _handle_external_command(command):
     """Handle external commands using subprocess."""
     try:
-        if platform.system() == "Windows":
+        args, shell = _shell_args(command)
+        cwd = get_cwd()
+        try:
             result = subprocess.run(
-                command,
-                shell=True,
+                args,
+                shell=shell,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=30,
+                cwd=cwd
             )
-        else:
+        except FileNotFoundError:
+            # Shell builtins have no executable of their own; let the shell run them
             result = subprocess.run(
                 command,
                 shell=True,
                 capture_output=True,
                 text=True,
-                timeout=30
+                timeout=30,
+                cwd=cwd
             )
         
         if result.returncode == 0:
@@ -488,7 +774,8 @@ def _handle_external_command(command):
 @app.route('/')
 def index():
     """Main page with terminal interface."""
-    return render_template('index.html', ai_enabled=AI_ENABLED)
+    return render_template('index.html', ai_enabled=AI_ENABLED, current_dir=get_cwd(),
+                           native_commands=sorted(_DISPATCH))
 
 @app.route('/execute', methods=['POST'])
 def execute_command():
@@ -498,11 +785,11 @@ def execute_command():
         command = data.get('command', '').strip()
         
         if not command:
-            return jsonify({'success': False, 'output': '', 'error': 'Empty command'})
+            return ojsonify({'success': False, 'output': '', 'error': 'Empty command'})
         
         # Handle special commands
         if command.lower() in ['exit', 'quit', 'q']:
-            return jsonify({'success': True, 'output': 'Goodbye!', 'error': '', 'exit': True})
+            return ojsonify({'success': True, 'output': 'Goodbye!', 'error': '', 'exit': True})
         
         # Execute the command
         success, output, error = run_command(command)
@@ -513,27 +800,92 @@ def execute_command():
         
         # Handle clear command
         if output == "CLEAR_SCREEN":
-            return jsonify({'success': True, 'output': '', 'error': '', 'clear': True})
+            return ojsonify({'success': True, 'output': '', 'error': '', 'clear': True})
         
-        return jsonify({
+        result = {
             'success': success,
             'output': output,
             'error': error,
-            'current_dir': os.getcwd()
-        })
+            'current_dir': get_cwd()
+        }
+        
+        # Truncated cat output links to /cat, which only serves files under cwd
+        truncated_path = g.pop('cat_truncated_path', None)
+        if truncated_path:
+            result['truncated'] = True
+            result['file_path'] = _path_within_cwd(truncated_path)
+        
+        return ojsonify(result)
         
     except Exception as e:
-        return jsonify({'success': False, 'output': '', 'error': f'Server error: {str(e)}'})
+        return ojsonify({'success': False, 'output': '', 'error': f'Server error: {str(e)}'})
+
+@app.route('/execute_stream', methods=['POST'])
+def execute_command_stream():
+    """Execute a command and stream its output as Server-Sent Events."""
+    # Only a JSON body is accepted: cross-site pages cannot send one without a
+    # CORS preflight, so they cannot make a visitor's browser run commands
+    data = request.get_json(silent=True) or {}
+    command = str(data.get('command', '')).strip()
+    
+    if not command:
+        return Response(_sse({'success': False, 'error': 'Empty command'}, event='done'),
+                        mimetype='text/event-stream', headers=_SSE_HEADERS)
+    
+    session_id = get_session_id()
+    
+    if _route_command(command)[0] != "external":
+        # Native and AI commands complete quickly. Run them before the response
+        # starts so session changes such as a cd are still saved in the cookie.
+        success, output, error = run_command(command)
+        add_to_history(session_id, command, output, success)
+        if output == "CLEAR_SCREEN":
+            body = _sse({'success': True, 'error': '', 'clear': True}, event='done')
+        else:
+            body = _sse({'line': output}) if output else ""
+            body += _sse({'success': success, 'error': error, 'current_dir': get_cwd()}, event='done')
+        return Response(body, mimetype='text/event-stream', headers=_SSE_HEADERS)
+    
+    def generate():
+        status = {}
+        captured = []
+        captured_len = 0
+        for line in _stream_external_command(command, status):
+            if captured_len < STREAM_HISTORY_MAX_CHARS:
+                captured.append(line)
+                captured_len += len(line)
+            yield _sse({'line': line})
+        
+        output = "".join(captured)[:STREAM_HISTORY_MAX_CHARS]
+        add_to_history(session_id, command, output, status['success'])
+        yield _sse({'success': status['success'], 'error': status['error'], 'current_dir': get_cwd()}, event='done')
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers=_SSE_HEADERS)
+
+@app.route('/cat')
+def cat_file():
+    """Serve a whole file as plain text, letting the WSGI server use sendfile."""
+    path = request.args.get('path', '')
+    if not path:
+        abort(400)
+    
+    file_path = _path_within_cwd(path)
+    if file_path is None:
+        abort(403)
+    if not os.path.isfile(file_path):
+        abort(404)
+    
+    return send_file(file_path, mimetype='text/plain', conditional=True)
 
 @app.route('/history')
 def get_history():
     """Get command history for current session."""
     try:
         session_id = get_session_id()
-        history = command_history.get(session_id, [])
-        return jsonify({'history': history})
+        history = list(command_history.get(session_id, ()))
+        return ojsonify({'history': history})
     except Exception as e:
-        return jsonify({'error': f'Error getting history: {str(e)}'})
+        return ojsonify({'error': f'Error getting history: {str(e)}'})
 
 if __name__ == '__main__':
     print("Starting PyTerminal Web...")
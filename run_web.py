@@ -7,9 +7,25 @@ Simple launcher script for the PyTerminal Web application.
 
 import os
 import sys
+import subprocess
 import webbrowser
 import time
-from app import app
+import importlib.util
+
+# Gunicorn settings: a single gevent worker serves many concurrent requests
+# while keeping the in-memory session history and caches in one process.
+GUNICORN_ARGS = [
+    "-k", "gevent",
+    "-w", "1",
+    "--timeout", "60",
+    "-b", "0.0.0.0:5000",
+]
+
+def _gunicorn_available():
+    """Check whether gunicorn with gevent workers can be used on this platform."""
+    return (os.name != 'nt' and
+            importlib.util.find_spec("gunicorn") is not None and
+            importlib.util.find_spec("gevent") is not None)
 
 def main():
     """Launch the PyTerminal Web application."""
@@ -42,9 +58,19 @@ def main():
     browser_thread.daemon = True
     browser_thread.start()
     
-    # Start Flask app
+    # Start the server: gunicorn where available, Flask's threaded server otherwise
     try:
-        app.run(debug=False, host='0.0.0.0', port=5000)
+        if _gunicorn_available():
+            subprocess.run(
+                [sys.executable, "-m", "gunicorn", *GUNICORN_ARGS,
+                 "--chdir", os.path.dirname(os.path.abspath(__file__)), "wsgi:app"],
+                check=True
+            )
+        else:
+            # Import here so a gunicorn launch doesn't load the caches and
+            # start the stats thread in this parent process as well
+            from app import app
+            app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         print("\n\n👋 PyTerminal Web stopped. Goodbye!")
     except Exception as e:
@@ -9,20 +9,19 @@ Author: AI Assistant
 """
 
 import subprocess
+import shlex
+import heapq
 import sys
 import os
-import platform
 import stat
 from pathlib import Path
-import psutil
 from colorama import Fore, Style, init
-import openai
 import json
+import re
 
 # --- Command History and Auto-Completion Imports ---
 import readline
 import atexit
-import glob
 
 # Initialize colorama for cross-platform color support
 init(autoreset=True)
@@ -30,10 +29,47 @@ init(autoreset=True)
 
 # --- Command History Setup ---
 HISTFILE = os.path.expanduser("~/.pyterminal_history")
-try:
-    readline.read_history_file(HISTFILE)
-except FileNotFoundError:
-    pass
+HISTORY_LENGTH = 5000
+# History files larger than this are tail-loaded instead of read in full
+HISTORY_TAIL_BYTES = 256 * 1024
+
+
+def _load_history():
+    """Load at most the last HISTORY_LENGTH entries of the history file."""
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        size = os.path.getsize(HISTFILE)
+    except OSError:
+        return
+    
+    # libedit (macOS) uses its own file format, so let it parse the file itself
+    if size <= HISTORY_TAIL_BYTES or "libedit" in (readline.__doc__ or ""):
+        try:
+            readline.read_history_file(HISTFILE)
+        except OSError:
+            return
+        # set_history_length only truncates on write, so trim what was read
+        length = readline.get_current_history_length()
+        if length > HISTORY_LENGTH:
+            keep = [readline.get_history_item(i)
+                    for i in range(length - HISTORY_LENGTH + 1, length + 1)]
+            readline.clear_history()
+            for line in keep:
+                readline.add_history(line)
+        return
+    
+    try:
+        with open(HISTFILE, 'rb') as f:
+            f.seek(-HISTORY_TAIL_BYTES, os.SEEK_END)
+            # Drop the first line, which is most likely cut off by the seek
+            lines = f.read().splitlines()[1:]
+    except OSError:
+        return
+    for line in lines[-HISTORY_LENGTH:]:
+        readline.add_history(line.decode('utf-8', errors='replace'))
+
+
+_load_history()
 atexit.register(readline.write_history_file, HISTFILE)
 
 # --- Auto-Completion Setup ---
@@ -42,27 +78,74 @@ INTERNAL_COMMANDS = [
     "processes", "ps", "help", "tellmeabout_developer", "clear", "exit", "quit", "q"
 ]
 
-def completer(text, state):
+# Commands grouped by first letter so completion only scans one bucket
+_COMPLETION_BUCKETS = {
+    letter: tuple(cmd for cmd in INTERNAL_COMMANDS if cmd[0] == letter)
+    for letter in {cmd[0] for cmd in INTERNAL_COMMANDS}
+}
+
+# Last directory listed for completion: (st_dev, st_ino, st_mtime_ns, entries)
+_dir_listing_cache = None
+
+
+def _list_dir_cached(dirname):
     """
-    Auto-complete for internal commands and file/directory names.
+    List (name, is_dir) pairs for a directory, reusing the previous listing
+    while the directory is unchanged.
     """
-    # Get the current input line
-    line = readline.get_line_buffer()
+    global _dir_listing_cache
+    st = os.stat(dirname)
+    key = (st.st_dev, st.st_ino, st.st_mtime_ns)
+    if _dir_listing_cache is not None and _dir_listing_cache[:3] == key:
+        return _dir_listing_cache[3]
+    
+    with os.scandir(dirname) as it:
+        entries = tuple((entry.name, entry.is_dir()) for entry in it)
+    _dir_listing_cache = key + (entries,)
+    return entries
+
+
+# Options from the last completion, keyed by (text, line buffer); readline
+# calls the completer once per state value for the same input
+_last_completion = (None, [])
+
+
+def _completion_options(text, line):
+    """Compute completion options for the word being typed, ignoring case."""
+    prefix = text.lower()
     split_line = line.strip().split()
     # If first word, complete command
     if len(split_line) == 0 or (len(split_line) == 1 and not line.endswith(' ')):
-        options = [cmd for cmd in INTERNAL_COMMANDS if cmd.startswith(text)]
-    else:
-        # Complete file/dir names for argument
-        arg = text or ''
-        # Use glob to match files/dirs
-        options = glob.glob(arg + '*')
-        # Add trailing slash for directories
-        options = [o + ('/' if os.path.isdir(o) else '') for o in options]
-    # If multiple options, print them all on first Tab press
-    if state == 0 and len(options) > 1:
-        print('\n' + '  '.join(options))
-        readline.redisplay()
+        candidates = _COMPLETION_BUCKETS.get(prefix[:1], ()) if text else INTERNAL_COMMANDS
+        return [cmd for cmd in candidates if cmd.startswith(prefix)]
+    
+    # Complete file/dir names for argument, hiding dotfiles unless asked for
+    dirname, basename = os.path.split(text or '')
+    try:
+        entries = _list_dir_cached(dirname or '.')
+    except OSError:
+        entries = ()
+    show_hidden = basename.startswith('.')
+    basename = basename.lower()
+    # Add trailing slash for directories
+    return sorted(
+        os.path.join(dirname, name) + ('/' if is_dir else '')
+        for name, is_dir in entries
+        if name.lower().startswith(basename) and (show_hidden or not name.startswith('.'))
+    )
+
+
+def completer(text, state):
+    """
+    Auto-complete for internal commands and file/directory names.
+    """
+    global _last_completion
+    # Get the current input line
+    key = (text, readline.get_line_buffer())
+    if state == 0 or _last_completion[0] != key:
+        _last_completion = (key, _completion_options(*key))
+    # Listing multiple matches is left to readline (show-all-if-ambiguous)
+    options = _last_completion[1]
     try:
         return options[state]
     except IndexError:
@@ -70,6 +153,8 @@ def completer(text, state):
 
 readline.set_completer(completer)
 readline.parse_and_bind('tab: complete')
+readline.parse_and_bind('set show-all-if-ambiguous on')
+readline.parse_and_bind('set completion-ignore-case on')
 
 # OpenAI API configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -77,9 +162,42 @@ if not OPENAI_API_KEY:
     print(f"{Fore.YELLOW}Warning: OPENAI_API_KEY environment variable not set. AI features will be disabled.{Style.RESET_ALL}")
     AI_ENABLED = False
 else:
-    openai.api_key = OPENAI_API_KEY
     AI_ENABLED = True
 
+# psutil and openai are slow to import, so load them on first use
+_psutil = None
+_openai = None
+
+
+def _get_psutil():
+    """Import psutil on first use."""
+    global _psutil
+    if _psutil is None:
+        import psutil
+        _psutil = psutil
+    return _psutil
+
+
+def _get_openai():
+    """Import and configure openai on first use."""
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = OPENAI_API_KEY
+        _openai = openai
+    return _openai
+
+# Commands never sent to AI, including 'clear' which main() handles itself
+_NATIVE_CMDS = frozenset({
+    "pwd", "ls", "cd", "mkdir", "rm", "cat", "cpu", "mem", "memory",
+    "processes", "ps", "help", "tellmeabout_developer", "clear"
+})
+_EXIT_COMMANDS = frozenset({"exit", "quit", "q"})
+
+# Common natural language phrasings, matched in a single pass
+NATURAL_LANGUAGE_PATTERNS = ("show me", "list all", "create a", "what is", "how to", "can you")
+_NL_PATTERN = re.compile("|".join(map(re.escape, NATURAL_LANGUAGE_PATTERNS)), re.IGNORECASE)
+
 
 def run_command(command):
     """
@@ -92,8 +210,12 @@ def run_command(command):
     Returns:
         tuple: (success: bool, output: str, error: str)
     """
-    # Split command into parts
-    parts = command.strip().split()
+    # Split command into parts, honouring quotes (e.g. cat "my file.txt")
+    try:
+        parts = shlex.split(command, posix=(os.name != 'nt'))
+    except ValueError:
+        # Unbalanced quotes, common in natural language ("what's ...")
+        parts = command.strip().split()
     if not parts:
         return False, "", "Empty command"
     
@@ -103,42 +225,21 @@ def run_command(command):
     # Check if this should be processed by AI
     # If command is longer than 2 words and doesn't match any native command, use AI
     if (len(parts) > 2 and 
-        cmd not in ["pwd", "ls", "cd", "mkdir", "rm", "cat", "cpu", "mem", "memory", 
-                   "processes", "ps", "help", "tellmeabout_developer", "clear"] and
+        cmd not in _NATIVE_CMDS and
         AI_ENABLED):
         return _handle_ai_command(command)
     
     # Also check for common natural language patterns even with fewer words
-    natural_language_patterns = ["show me", "list all", "create a", "what is", "how to", "can you"]
-    if (any(pattern in command.lower() for pattern in natural_language_patterns) and AI_ENABLED):
+    if AI_ENABLED and _NL_PATTERN.search(command):
         return _handle_ai_command(command)
     
     # Handle native Python commands with robust error handling
-    if cmd == "pwd":
-        return _handle_pwd()
-    elif cmd == "ls":
-        return _handle_ls(args)
-    elif cmd == "cd":
-        return _handle_cd_robust(args)
-    elif cmd == "mkdir":
-        return _handle_mkdir_robust(args)
-    elif cmd == "rm":
-        return _handle_rm_robust(args)
-    elif cmd == "cat":
-        return _handle_cat_robust(args)
-    elif cmd == "cpu":
-        return _handle_cpu()
-    elif cmd in ["mem", "memory"]:
-        return _handle_memory()
-    elif cmd in ["processes", "ps"]:
-        return _handle_processes()
-    elif cmd == "help":
-        return _handle_help()
-    elif cmd == "tellmeabout_developer":
-        return _handle_developer_info()
-    else:
-        # For non-native commands, use subprocess
-        return _handle_external_command(command)
+    handler = _DISPATCH.get(cmd)
+    if handler:
+        return handler(args)
+    
+    # For non-native commands, use subprocess; reuse the parsed argv
+    return _handle_external_command(command, parts)
 
 
 def _handle_pwd():
@@ -150,6 +251,11 @@ def _handle_pwd():
         return False, "", f"Error getting current directory: {str(e)}"
 
 
+# Size thresholds for ls output
+_KB = 1024
+_MB = 1024 * 1024
+
+
 def _handle_ls(args):
     """Handle ls command - list directory contents."""
     try:
@@ -163,30 +269,31 @@ def _handle_ls(args):
         if not os.path.isdir(target_dir):
             return False, "", f"Not a directory: '{target_dir}'"
         
-        # List directory contents
-        items = os.listdir(target_dir)
-        if not items:
+        # List directory contents; DirEntry caches type and stat results
+        with os.scandir(target_dir) as it:
+            entries = list(it)
+        if not entries:
             return True, "Directory is empty\n", ""
+        entries.sort(key=lambda e: e.name)
         
         # Format output with file/folder indicators
         output_lines = []
-        for item in sorted(items):
-            item_path = os.path.join(target_dir, item)
-            if os.path.isdir(item_path):
-                output_lines.append(f"📁 {item}/")
+        for entry in entries:
+            if entry.is_dir():
+                output_lines.append(f"📁 {entry.name}/")
             else:
                 # Get file size for display
                 try:
-                    size = os.path.getsize(item_path)
-                    if size < 1024:
+                    size = entry.stat().st_size
+                    if size < _KB:
                         size_str = f"{size}B"
-                    elif size < 1024 * 1024:
-                        size_str = f"{size // 1024}KB"
+                    elif size < _MB:
+                        size_str = f"{size // _KB}KB"
                     else:
-                        size_str = f"{size // (1024 * 1024)}MB"
-                    output_lines.append(f"📄 {item} ({size_str})")
+                        size_str = f"{size // _MB}MB"
+                    output_lines.append(f"📄 {entry.name} ({size_str})")
                 except OSError:
-                    output_lines.append(f"📄 {item}")
+                    output_lines.append(f"📄 {entry.name}")
         
         return True, "\n".join(output_lines) + "\n", ""
         
@@ -201,6 +308,7 @@ def _handle_cd(args):
             # No argument - go to home directory
             home_dir = os.path.expanduser("~")
             os.chdir(home_dir)
+            _update_cwd()
             return True, "", ""  # Silent success - prompt will show new directory
         
         target_dir = args[0]
@@ -218,6 +326,7 @@ def _handle_cd(args):
             # Regular directory change
             os.chdir(target_dir)
         
+        _update_cwd()
         return True, "", ""  # Silent success - prompt will show new directory
         
     except FileNotFoundError:
@@ -321,31 +430,36 @@ def _handle_cat(args):
 def _handle_cpu():
     """Handle cpu command - show CPU usage percentage."""
     try:
+        psutil = _get_psutil()
         cpu_percent = psutil.cpu_percent(interval=1)
         return True, f"{Fore.YELLOW}CPU Usage: {cpu_percent}%{Style.RESET_ALL}\n", ""
     except Exception as e:
         return False, "", f"Error getting CPU usage: {str(e)}"
 
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
+def _format_bytes(bytes_value):
+    """Format a byte count with one decimal, picking the unit from its bit length."""
+    idx = min(max(bytes_value.bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (10 * idx)):.1f} {_BYTE_UNITS[idx]}"
+
+
 def _handle_memory():
     """Handle mem/memory command - show memory usage details."""
     try:
+        psutil = _get_psutil()
         memory = psutil.virtual_memory()
         
-        # Convert bytes to human readable format
-        def format_bytes(bytes_value):
-            for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-                if bytes_value < 1024.0:
-                    return f"{bytes_value:.1f} {unit}"
-                bytes_value /= 1024.0
-            return f"{bytes_value:.1f} PB"
+        total = _format_bytes(memory.total)
+        available = _format_bytes(memory.available)
+        used = _format_bytes(memory.used)
         
-        total = format_bytes(memory.total)
-        available = format_bytes(memory.available)
-        used = format_bytes(memory.used)
-        
-        output = f"{Fore.YELLOW}Memory Usage: {memory.percent}%{Style.RESET_ALL}\n"
-        output += f"{Fore.YELLOW}Total: {total} | Available: {available} | Used: {used}{Style.RESET_ALL}\n"
+        output = "\n".join([
+            f"{Fore.YELLOW}Memory Usage: {memory.percent}%{Style.RESET_ALL}",
+            f"{Fore.YELLOW}Total: {total} | Available: {available} | Used: {used}{Style.RESET_ALL}",
+        ]) + "\n"
         
         return True, output, ""
     except Exception as e:
@@ -355,45 +469,32 @@ def _handle_memory():
 def _handle_processes():
     """Handle processes/ps command - show running processes."""
     try:
-        processes = []
-        total_count = 0
-        
-        # Collect process information
-        for proc in psutil.process_iter(['pid', 'name']):
-            total_count += 1
-            try:
-                processes.append((proc.info['pid'], proc.info['name']))
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                # Skip processes that can't be accessed
-                continue
+        psutil = _get_psutil()
+        # process_iter already skips processes that vanish or deny access
+        # while their attrs are being read
+        processes = [(p.info['pid'], p.info['name']) for p in psutil.process_iter(['pid', 'name'])]
+        total_count = len(processes)
         
-        # Sort by PID for consistent output
-        processes.sort(key=lambda x: x[0])
+        # Keep the 20 lowest PIDs, sorted for consistent output
+        processes = heapq.nsmallest(20, processes)
         
         # Format output
-        output = f"Total Processes: {total_count}\n"
-        output += "Showing top 20:\n"
-        output += "PID     Name\n"
-        output += "-" * 30 + "\n"
-        
-        # Show first 20 processes
-        for pid, name in processes[:20]:
-            output += f"{pid:<8} {name}\n"
+        parts = [f"Total Processes: {total_count}", "Showing top 20:", "PID     Name", "-" * 30]
+        parts.extend([f"{pid:<8} {name}" for pid, name in processes])
         
         if total_count > 20:
-            output += f"... and {total_count - 20} more processes\n"
+            parts.append(f"... and {total_count - 20} more processes")
         
+        output = "\n".join(parts) + "\n"
         return True, output, ""
     except Exception as e:
         return False, "", f"Error getting process list: {str(e)}"
 
 
-def _handle_help():
-    """Handle help command - show available commands and descriptions."""
-    try:
-        ai_status = f"{Fore.GREEN}Enabled{Style.RESET_ALL}" if AI_ENABLED else f"{Fore.RED}Disabled{Style.RESET_ALL}"
-        
-        help_text = f"""{Fore.BLUE}Available Commands:{Style.RESET_ALL}
+# Static help and developer text, built once since AI_ENABLED is fixed at startup
+_AI_STATUS = f"{Fore.GREEN}Enabled{Style.RESET_ALL}" if AI_ENABLED else f"{Fore.RED}Disabled{Style.RESET_ALL}"
+
+_HELP_TEXT = f"""{Fore.BLUE}Available Commands:{Style.RESET_ALL}
 {Fore.CYAN}ls <dir>{Style.RESET_ALL}     - List files and directories in the current folder
 {Fore.CYAN}cd <dir>{Style.RESET_ALL}     - Change the current working directory
 {Fore.CYAN}pwd{Style.RESET_ALL}          - Print the current working directory
@@ -410,21 +511,13 @@ def _handle_help():
 
 {Fore.MAGENTA}AI Features:{Style.RESET_ALL}
 {Fore.CYAN}Natural Language{Style.RESET_ALL} - Type natural language commands (3+ words)
-{Fore.CYAN}AI Status:{Style.RESET_ALL} {ai_status}
+{Fore.CYAN}AI Status:{Style.RESET_ALL} {_AI_STATUS}
 
 {Fore.YELLOW}Note: External system commands are also supported through subprocess.{Style.RESET_ALL}
 
-{Fore.LIGHTBLUE_EX}designed by Abhinav{Style.RESET_ALL}"""
-        
-        return True, help_text + "\n", ""
-    except Exception as e:
-        return False, "", f"Error displaying help: {str(e)}"
+{Fore.LIGHTBLUE_EX}designed by Abhinav{Style.RESET_ALL}""" + "\n"
 
-
-def _handle_developer_info():
-    """Handle tellmeabout_developer command - show developer information."""
-    try:
-        developer_info = f"""
+_DEVELOPER_INFO = f"""
 {Fore.CYAN}+==============================================================+{Style.RESET_ALL}
 {Fore.CYAN}|                    {Style.BRIGHT}DEVELOPER INFORMATION{Style.RESET_ALL}{Fore.CYAN}                    |{Style.RESET_ALL}
 {Fore.CYAN}+==============================================================+{Style.RESET_ALL}
@@ -440,10 +533,16 @@ def _handle_developer_info():
 
 {Fore.LIGHTBLUE_EX}Thank you for using PyTerminal!{Style.RESET_ALL}
 """
-        
-        return True, developer_info, ""
-    except Exception as e:
-        return False, "", f"Error displaying developer information: {str(e)}"
+
+
+def _handle_help():
+    """Handle help command - show available commands and descriptions."""
+    return True, _HELP_TEXT, ""
+
+
+def _handle_developer_info():
+    """Handle tellmeabout_developer command - show developer information."""
+    return True, _DEVELOPER_INFO, ""
 
 
 def interpret_natural_language(user_input):
@@ -459,6 +558,8 @@ def interpret_natural_language(user_input):
     if not AI_ENABLED:
         return False, "", "", f"{Fore.RED}AI features are disabled. Please set OPENAI_API_KEY environment variable.{Style.RESET_ALL}"
     
+    openai = _get_openai()
+    
     try:
         # Use the exact system prompt as specified
         system_prompt = """You are a helpful assistant that converts natural language requests into terminal commands. 
@@ -559,6 +660,7 @@ def _handle_cd_robust(args):
             # Regular directory change
             os.chdir(target_dir)
         
+        _update_cwd()
         return True, "", ""  # Silent success - prompt will show new directory
         
     except FileNotFoundError:
@@ -621,6 +723,37 @@ def _handle_rm_robust(args):
         return False, "", f"rm: error: {str(e)}"
 
 
+# cat copies files to stdout in chunks of this size
+CAT_CHUNK_SIZE = 1 << 20
+_HAS_SENDFILE = hasattr(os, "sendfile")
+# Raw descriptor flags; O_BINARY only exists (and matters) on Windows
+_CAT_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _sendfile_to_stdout(fd):
+    """
+    Copy an open file descriptor to stdout in the kernel with os.sendfile.
+    
+    Returns:
+        bool: False if sendfile is unsupported here and nothing was written
+    """
+    out_fd = sys.stdout.fileno()
+    copied = 0
+    try:
+        # Copy until end of file rather than to st_size, which is 0 for
+        # procfs/sysfs files and stale for files that are still growing
+        while True:
+            sent = os.sendfile(out_fd, fd, None, CAT_CHUNK_SIZE)
+            if sent == 0:
+                break
+            copied += sent
+    except OSError:
+        if copied:
+            raise
+        return False
+    return True
+
+
 def _handle_cat_robust(args):
     """Handle cat command with robust error handling."""
     # Check if argument was provided
@@ -637,27 +770,57 @@ def _handle_cat_robust(args):
         if not os.path.isfile(file_name):
             return False, "", f"cat: '{file_name}' is not a file"
         
-        # Read and display file contents
-        with open(file_name, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-        
-        return True, content + "\n", ""
+        # Stream raw bytes straight to stdout in constant memory, with no
+        # file object or codec in between
+        fd = os.open(file_name, _CAT_OPEN_FLAGS)
+        try:
+            sys.stdout.flush()
+            out = sys.stdout.buffer
+            if not (_HAS_SENDFILE and not sys.stdout.isatty() and _sendfile_to_stdout(fd)):
+                while True:
+                    chunk = os.read(fd, CAT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            out.write(b"\n")
+            out.flush()
+        finally:
+            os.close(fd)
+        
+        return True, "", ""
         
     except FileNotFoundError:
         return False, "", f"cat: no such file: '{file_name}'"
     except PermissionError:
         return False, "", f"cat: permission denied: '{file_name}'"
-    except UnicodeDecodeError:
-        return False, "", f"cat: cannot read file (binary or encoding issue): '{file_name}'"
     except Exception as e:
         return False, "", f"cat: error: {str(e)}"
 
 
-def _handle_external_command(command):
-    """Handle external commands using subprocess."""
+# cmd.exe parsing differs from POSIX shells, so Windows always goes through the shell
+_IS_WINDOWS = os.name == "nt"
+# Characters that require a shell to interpret the command line
+_SHELL_META = frozenset("|&;<>(){}$`\\\"'*?[]~#\n")
+
+
+def _needs_shell(command):
+    """Return True if the command uses shell syntax and cannot be exec'd directly."""
+    if _IS_WINDOWS or any(c in _SHELL_META for c in command):
+        return True
+    # Leading VAR=value assignments are also shell syntax
+    return "=" in command.split(None, 1)[0]
+
+
+def _handle_external_command(command, argv=None):
+    """
+    Handle external commands using subprocess.
+    
+    Args:
+        command (str): The command line as typed
+        argv (list): Optional pre-split arguments, used when no shell is needed
+    """
     try:
-        # Handle different shell commands based on the operating system
-        if platform.system() == "Windows":
+        if _needs_shell(command):
             result = subprocess.run(
                 command,
                 shell=True,
@@ -666,13 +829,26 @@ def _handle_external_command(command):
                 timeout=30
             )
         else:
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            # Exec directly without an intermediate shell; with close_fds=False
+            # CPython can use posix_spawn instead of fork+exec
+            try:
+                result = subprocess.run(
+                    argv if argv is not None else shlex.split(command),
+                    shell=False,
+                    close_fds=False,
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                )
+            except FileNotFoundError:
+                # Shell builtins have no executable of their own; let the shell run them
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=30
+                )
         
         if result.returncode == 0:
             return True, result.stdout, result.stderr
@@ -691,6 +867,42 @@ def _handle_external_command(command):
 
 
 
+# Native command dispatch table, keyed by command name
+_DISPATCH = {
+    "pwd": lambda args: _handle_pwd(),
+    "ls": _handle_ls,
+    "cd": _handle_cd_robust,
+    "mkdir": _handle_mkdir_robust,
+    "rm": _handle_rm_robust,
+    "cat": _handle_cat_robust,
+    "cpu": lambda args: _handle_cpu(),
+    "mem": lambda args: _handle_memory(),
+    "memory": lambda args: _handle_memory(),
+    "processes": lambda args: _handle_processes(),
+    "ps": lambda args: _handle_processes(),
+    "help": lambda args: _handle_help(),
+    "tellmeabout_developer": lambda args: _handle_developer_info(),
+}
+
+
+# Prompt pieces around the directory, and the working directory cached
+# between cd commands so rendering the prompt needs no getcwd syscall
+_PROMPT_PREFIX = f"{Fore.GREEN}["
+_PROMPT_SUFFIX = f"]{Style.RESET_ALL} {Fore.LIGHTGREEN_EX}$ {Style.RESET_ALL}"
+_PROMPT_FALLBACK = f"{Fore.LIGHTGREEN_EX}$ {Style.RESET_ALL}"
+_CWD = None
+_prompt_cache = (None, _PROMPT_FALLBACK)
+
+
+def _update_cwd():
+    """Refresh the cached working directory after a directory change."""
+    global _CWD
+    try:
+        _CWD = os.getcwd()
+    except OSError:
+        _CWD = None
+
+
 def get_prompt():
     """
     Generate the terminal prompt string with current working directory.
@@ -698,14 +910,46 @@ def get_prompt():
     Returns:
         str: Colorized formatted prompt string
     """
-    try:
-        current_dir = os.getcwd()
+    global _prompt_cache
+    if _CWD is None:
+        return _PROMPT_FALLBACK
+    if _prompt_cache[0] is not _CWD:
+        current_dir = _CWD
         # Truncate long paths for better readability
         if len(current_dir) > 50:
             current_dir = "..." + current_dir[-47:]
-        return f"{Fore.GREEN}[{current_dir}]{Style.RESET_ALL} {Fore.LIGHTGREEN_EX}$ {Style.RESET_ALL}"
-    except Exception:
-        return f"{Fore.LIGHTGREEN_EX}$ {Style.RESET_ALL}"
+        _prompt_cache = (_CWD, _PROMPT_PREFIX + current_dir + _PROMPT_SUFFIX)
+    return _prompt_cache[1]
+
+
+_update_cwd()
+
+
+def _clear_screen():
+    """
+    Clear the screen with ANSI escapes instead of spawning a shell.
+    
+    On Windows consoles without VT support colorama translates these
+    sequences into console API calls.
+    """
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
+
+
+# Header shown at startup and after clear
+_BANNER = "\n".join(line + Style.RESET_ALL for line in (
+    Fore.CYAN + "=" * 60,
+    Fore.CYAN + Style.BRIGHT + "            PyTerminal (Python Powered)",
+    Fore.LIGHTBLUE_EX + "                designed by Abhinav",
+    Fore.YELLOW + "Type 'help' for available commands.",
+    Fore.CYAN + "=" * 60,
+))
+
+
+# Colour wrappers for command results, concatenated into a single write
+_WARN_PREFIX = f"{Fore.YELLOW}Warning: "
+_ERR_PREFIX = f"{Fore.RED}Error: "
+_ERR_SUFFIX = f"{Style.RESET_ALL}"
 
 
 def main():
@@ -713,14 +957,12 @@ def main():
     Main function that runs the terminal emulator loop.
     """
     # Clear the screen for a clean start
-    os.system('cls' if os.name == 'nt' else 'clear')
+    _clear_screen()
     
     # Display persistent header with colors
-    print(Fore.CYAN + "=" * 60)
-    print(Fore.CYAN + Style.BRIGHT + "            PyTerminal (Python Powered)")
-    print(Fore.LIGHTBLUE_EX + "                designed by Abhinav")
-    print(Fore.YELLOW + "Type 'help' for available commands.")
-    print(Fore.CYAN + "=" * 60)
+    print(_BANNER)
+    
+    write = sys.stdout.write
     
     # Main terminal loop
     while True:
@@ -733,35 +975,32 @@ def main():
                 continue
                 
             # Handle exit commands
-            if user_input.lower() in ['exit', 'quit', 'q']:
+            if user_input.lower() in _EXIT_COMMANDS:
                 print("Goodbye!")
                 break
                 
             # Handle clear command
             if user_input.lower() == 'clear':
-                os.system('cls' if os.name == 'nt' else 'clear')
+                _clear_screen()
                 # Re-display header after clear
-                print(Fore.CYAN + "=" * 60)
-                print(Fore.CYAN + Style.BRIGHT + "            PyTerminal (Python Powered)")
-                print(Fore.LIGHTBLUE_EX + "                designed by Abhinav")
-                print(Fore.YELLOW + "Type 'help' for available commands.")
-                print(Fore.CYAN + "=" * 60)
+                print(_BANNER)
                 continue
             
             # Execute the command
             success, output, error = run_command(user_input)
             
             # Display results
+            # (input() flushes stdout before the next prompt is shown)
             if success:
                 if output:
-                    print(output, end="")
+                    write(output)
                 if error:
-                    print(f"{Fore.YELLOW}Warning: {error}{Style.RESET_ALL}", end="")
+                    write(_WARN_PREFIX + error + _ERR_SUFFIX)
             else:
                 if error:
-                    print(f"{Fore.RED}Error: {error}{Style.RESET_ALL}", end="")
+                    write(_ERR_PREFIX + error + _ERR_SUFFIX)
                 if output:
-                    print(f"Output: {output}", end="")
+                    write("Output: " + output)
                     
         except KeyboardInterrupt:
             print("\n\nUse 'exit' or 'quit' to close the terminal")
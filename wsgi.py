@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+PyTerminal Web WSGI Entry Point
+
+Exposes the Flask application for production WSGI servers, e.g.:
+
+    gunicorn -k gevent -w 1 --timeout 60 wsgi:app
+"""
+
+from app import app
+
+if __name__ == "__main__":
+    app.run(debug=False, host='0.0.0.0', port=5000)